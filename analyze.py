@@ -0,0 +1,172 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import re
+from multiprocessing import Pool
+from stats import EventStats
+from hlc import to_ms
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
+
+# Regular expression patterns to extract log entries, clock rate, and run info from file names
+log_pattern = re.compile(r"(.+?) \| ([\d.]+) \| (\d+) \| (\d+)")
+clock_rate_pattern = re.compile(r"Clock Rate: (\d+) ticks per second")
+hlc_drift_pattern = re.compile(r".+? \| [\d.]+ \| \d+ \| \d+ \| (-?\d+)")
+log_name_pattern = re.compile(r"([A-Z])(\d+)(_.*)?\.log")
+
+# One row per log file, i.e. per (run, process)
+columns = [
+    "Log File", "Run", "Process", "Clock Speed", "Events", "Sends", "Receives", "Internals",
+    "Avg Jump", "Jump Variance", "Avg Queue Len", "Max Queue Len",
+    "Queue Len P50", "Queue Len P90", "Queue Len P99", "Clock Mode", "Avg HLC Drift", "Max HLC Drift",
+]
+
+def row_from_summary(summary):
+    """Maps an EventStats summary onto the output columns."""
+    return {
+        "Clock Speed": summary.get("clock_rate"),
+        "Events": summary["events"],
+        "Sends": summary["sends"],
+        "Receives": summary["receives"],
+        "Internals": summary["internals"],
+        "Avg Jump": summary["jump_mean"],
+        "Jump Variance": summary["jump_variance"],
+        "Avg Queue Len": summary["queue_mean"],
+        "Max Queue Len": summary["queue_max"],
+        "Queue Len P50": summary["queue_p50"],
+        "Queue Len P90": summary["queue_p90"],
+        "Queue Len P99": summary["queue_p99"],
+        "Clock Mode": summary.get("clock_mode", "lamport"),
+        "Avg HLC Drift": summary.get("drift_mean", 0.0),
+        "Max HLC Drift": summary.get("drift_max", 0),
+    }
+
+def analyze_log(log_path, use_summary=True):
+    """Computes one result row for a log file, streaming it line by line."""
+    log_file = os.path.basename(log_path)
+    process, run_id, variant = log_name_pattern.match(log_file).groups()
+    row = {"Log File": log_file, "Run": f"Run {run_id}{variant or ''}", "Process": process}
+
+    # A summary older than its log belongs to an earlier run with the same id
+    summary_file = os.path.splitext(log_path)[0] + ".summary.json"
+    if use_summary and os.path.exists(summary_file) and os.path.getmtime(summary_file) >= os.path.getmtime(log_path):
+        with open(summary_file, "r") as file:
+            row.update(row_from_summary(json.load(file)))
+        return row
+
+    stats = EventStats()
+    clock_rate = None
+    clock_mode = "lamport"
+    with open(log_path, "r") as file:
+        for line in file:
+            if clock_rate is None:  # Clock rate is on the first line
+                match_clock = clock_rate_pattern.match(line)
+                if match_clock:
+                    clock_rate = int(match_clock.group(1))
+                    continue
+            if line.startswith("Clock Mode: hlc"):
+                clock_mode = "hlc"
+                continue
+
+            match = log_pattern.match(line)
+            if match:
+                event_type, _, queue_len, log_clock = match.groups()
+                if clock_mode == "hlc":  # Packed timestamp, compare jumps in milliseconds
+                    drift = int(hlc_drift_pattern.match(line).group(1))
+                    stats.update(event_type, int(queue_len), to_ms(int(log_clock)), drift)
+                else:
+                    stats.update(event_type, int(queue_len), int(log_clock))
+
+    row.update(row_from_summary({**stats.summary(), "clock_rate": clock_rate, "clock_mode": clock_mode}))
+    return row
+
+def _analyze_log_task(task):
+    return analyze_log(*task)
+
+def iter_log_files(log_dir):
+    """Yields paths of run logs without building a listing of the whole directory."""
+    with os.scandir(log_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and log_name_pattern.fullmatch(entry.name):
+                yield entry.path
+
+def analyze(log_dir, csv_path, parquet_path=None, workers=None, chunksize=16, batch_size=1024, use_summary=True):
+    """Analyzes every log in log_dir on a process pool, streaming rows to CSV (and Parquet).
+
+    Pool.imap_unordered drains its whole task iterable up front, so paths are handed to
+    the pool a window at a time. Rows are written as workers finish, so memory depends on
+    the pool, window, and batch size rather than on how many logs there are. Returns the
+    number of rows written.
+    """
+    if parquet_path and pa is None:
+        raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+
+    paths = iter_log_files(log_dir)
+    window = 4 * chunksize * (workers or os.cpu_count() or 1)  # Paths in flight at a time
+    parquet_writer = None
+    batch = []
+    count = 0
+
+    def flush():
+        nonlocal parquet_writer
+        table = pa.Table.from_pylist(batch, schema=parquet_schema())
+        if parquet_writer is None:
+            parquet_writer = pq.ParquetWriter(parquet_path, table.schema)
+        parquet_writer.write_table(table)
+        batch.clear()
+
+    with open(csv_path, "w", newline="") as csv_file, Pool(processes=workers) as pool:
+        writer = csv.DictWriter(csv_file, fieldnames=columns)
+        writer.writeheader()
+        try:
+            while True:
+                tasks = [(path, use_summary) for path in itertools.islice(paths, window)]
+                if not tasks:
+                    break
+                for row in pool.imap_unordered(_analyze_log_task, tasks, chunksize=chunksize):
+                    writer.writerow(row)
+                    count += 1
+                    if parquet_path:
+                        batch.append(row)
+                        if len(batch) >= batch_size:
+                            flush()
+            if parquet_path and (batch or parquet_writer is None):
+                flush()
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+
+    return count
+
+def parquet_schema():
+    """Column types for the Parquet output."""
+    string_columns = {"Log File", "Run", "Process", "Clock Mode"}
+    int_columns = {"Clock Speed", "Events", "Sends", "Receives", "Internals", "Max Queue Len",
+                   "Queue Len P50", "Queue Len P90", "Queue Len P99", "Max HLC Drift"}
+    return pa.schema([
+        (name, pa.string() if name in string_columns else pa.int64() if name in int_columns else pa.float64())
+        for name in columns
+    ])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze all run logs in parallel.")
+    parser.add_argument("--log-dir", default="log/")
+    parser.add_argument("--csv", default="plots/log_analysis.csv", help="CSV output path")
+    parser.add_argument("--parquet", default=None, help="Optional Parquet output path (requires pyarrow)")
+    parser.add_argument("--workers", default=None, type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunksize", default=16, type=int, help="Log files handed to a worker at a time")
+    parser.add_argument("--reparse", action="store_true", help="Ignore .summary.json files and re-read every log")
+    args = parser.parse_args()
+
+    if args.parquet and pa is None:
+        parser.error("--parquet requires pyarrow (pip install pyarrow)")
+
+    count = analyze(args.log_dir, args.csv, args.parquet, args.workers, args.chunksize, use_summary=not args.reparse)
+    print(f"Analyzed {count} log files: {args.csv}{' and ' + args.parquet if args.parquet else ''}")
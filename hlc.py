@@ -0,0 +1,67 @@
+import threading
+import time
+
+# A timestamp packs the physical part (milliseconds since the epoch) in the high 48 bits
+# and the logical counter in the low 16 bits, so packed values order like (physical, logical).
+LOGICAL_BITS = 16
+LOGICAL_MASK = (1 << LOGICAL_BITS) - 1
+
+def pack(physical_ms, logical):
+    """Packs a (physical, logical) pair into one 64-bit integer."""
+    if logical > LOGICAL_MASK:
+        raise OverflowError(f"HLC logical counter exceeded {LOGICAL_MASK}")
+    return (physical_ms << LOGICAL_BITS) | logical
+
+def unpack(timestamp):
+    """Splits a packed timestamp into its (physical, logical) pair."""
+    return timestamp >> LOGICAL_BITS, timestamp & LOGICAL_MASK
+
+def to_ms(timestamp):
+    """Expresses a packed timestamp in milliseconds, with the counter as a fraction of a millisecond."""
+    physical_ms, logical = unpack(timestamp)
+    return physical_ms + logical / (1 << LOGICAL_BITS)
+
+class HybridLogicalClock:
+    """Hybrid Logical Clock (Kulkarni et al.) over the local wall clock.
+
+    Timestamps stay within a bounded distance of physical time while still respecting
+    causality like a Lamport clock.
+    """
+
+    def __init__(self, now=time.time):
+        self._now = now
+        self._lock = threading.Lock()
+        self.timestamp = 0
+
+    def _physical_ms(self):
+        return int(self._now() * 1000)
+
+    def tick(self):
+        """Advances the clock for a local or send event and returns the new timestamp."""
+        with self._lock:
+            last_physical, logical = unpack(self.timestamp)
+            physical = max(last_physical, self._physical_ms())
+            logical = logical + 1 if physical == last_physical else 0
+            self.timestamp = pack(physical, logical)
+            return self.timestamp
+
+    def receive(self, remote_timestamp):
+        """Merges a timestamp received in a message and returns the new timestamp."""
+        with self._lock:
+            last_physical, logical = unpack(self.timestamp)
+            remote_physical, remote_logical = unpack(int(remote_timestamp))
+            physical = max(last_physical, remote_physical, self._physical_ms())
+            if physical == last_physical == remote_physical:
+                logical = max(logical, remote_logical) + 1
+            elif physical == last_physical:
+                logical += 1
+            elif physical == remote_physical:
+                logical = remote_logical + 1
+            else:
+                logical = 0
+            self.timestamp = pack(physical, logical)
+            return self.timestamp
+
+    def drift_ms(self, system_time):
+        """How far the clock's physical part runs ahead of the given wall time, in ms."""
+        return unpack(self.timestamp)[0] - int(system_time * 1000)
@@ -0,0 +1,197 @@
+import argparse
+import os
+import re
+import time
+from collections import deque
+from hlc import unpack
+
+# Regular expression patterns to extract log entries and clock rate
+log_pattern = re.compile(r"(.+?) \| ([\d.]+) \| (\d+) \| (\d+)")
+clock_rate_pattern = re.compile(r"Clock Rate: (\d+) ticks per second")
+hlc_log_pattern = re.compile(r"(.+?) \| ([\d.]+) \| (\d+) \| (\d+) \| (-?\d+)")
+
+class LogTail:
+    """Follows a growing log file, parsing only the bytes appended since the last poll.
+
+    Keeps the most recent `window` samples of system time, logical clock, and queue
+    length, so memory and per-poll CPU do not grow with the length of the run.
+
+    With hlc=True the clock window holds the HLC logical counter and the drift window
+    the logged HLC drift from wall time, as in plot.py.
+    """
+
+    def __init__(self, path, window=500, hlc=False):
+        self.path = path
+        self.window = window
+        self.hlc = hlc
+        self.started = time.time()  # Summaries written before this belong to an earlier run
+        self.reset()
+
+    def reset(self):
+        """Forgets everything read so far."""
+        window = self.window
+        self.offset = 0
+        self._partial = b""
+        self.clock_rate = None
+        self.events = 0
+        self.system_time = deque(maxlen=window)
+        self.logical_clock = deque(maxlen=window)
+        self.queue_length = deque(maxlen=window)
+        self.drift_time = deque(maxlen=window)
+        self.drift = deque(maxlen=window)
+
+    def poll(self):
+        """Reads newly appended lines and returns how many log entries were parsed."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return 0  # Not created yet
+        if size < self.offset:  # Log was rewritten by a new run with the same id
+            self.reset()
+        if size == self.offset:
+            return 0
+
+        with open(self.path, "rb") as file:
+            file.seek(self.offset)
+            data = file.read(size - self.offset)
+        self.offset += len(data)
+
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()  # Last piece is incomplete until a newline arrives
+
+        parsed = 0
+        for raw in lines:
+            line = raw.decode()
+            if self.clock_rate is None:
+                match_clock = clock_rate_pattern.match(line)
+                if match_clock:
+                    self.clock_rate = int(match_clock.group(1))
+                    continue
+            if self.hlc:
+                match = hlc_log_pattern.match(line)
+                if match:
+                    _, sys_time, queue_len, hlc, hlc_drift = match.groups()
+                    self.system_time.append(float(sys_time))
+                    self.queue_length.append(int(queue_len))
+                    self.logical_clock.append(unpack(int(hlc))[1])
+                    self.drift_time.append(float(sys_time))
+                    self.drift.append(int(hlc_drift))
+                    parsed += 1
+                continue
+            match = log_pattern.match(line)
+            if match:
+                _, sys_time, queue_len, log_clock = match.groups()
+                self.system_time.append(float(sys_time))
+                self.queue_length.append(int(queue_len))
+                self.logical_clock.append(int(log_clock))
+                parsed += 1
+        self.events += parsed
+        return parsed
+
+    @property
+    def finished(self):
+        """Whether the VM wrote its shutdown summary after the last log write and after this tail started."""
+        summary_file = os.path.splitext(self.path)[0] + ".summary.json"
+        try:
+            return os.path.getmtime(summary_file) >= max(os.path.getmtime(self.path), self.started)
+        except OSError:
+            return False
+
+def record_drift(tails, now):
+    """Appends each process's current drift (clock minus the slowest clock) to its window.
+
+    HLC tails are skipped: their drift from wall time is read from the log instead.
+    """
+    latest = {process: tail.logical_clock[-1] for process, tail in tails.items() if tail.logical_clock and not tail.hlc}
+    if not latest:
+        return
+    min_clock = min(latest.values())
+    for process, clock in latest.items():
+        tails[process].drift_time.append(now)
+        tails[process].drift.append(clock - min_clock)
+
+def render_terminal(tails, run_id, mode):
+    """Redraws a one-line-per-process summary of the rolling windows."""
+    lines = [f"Run {run_id} ({mode}) - {time.strftime('%H:%M:%S')}",
+             f"{'Proc':<5}{'Rate':>5}{'Events':>8}{'Clock':>8}{'Drift':>7}{'Queue':>7}{'Avg Q':>8}{'Max Q':>7}"]
+    for process, tail in tails.items():
+        if not tail.logical_clock:
+            lines.append(f"{process:<5}{'waiting for log...':>20}")
+            continue
+        window_queue = tail.queue_length
+        lines.append(
+            f"{process:<5}{tail.clock_rate or '?':>5}{tail.events:>8}{tail.logical_clock[-1]:>8}"
+            f"{tail.drift[-1] if tail.drift else 0:>7}{window_queue[-1]:>7}"
+            f"{sum(window_queue) / len(window_queue):>8.2f}{max(window_queue):>7}"
+        )
+    print("\033[H\033[J" + "\n".join(lines), flush=True)
+
+class LivePlot:
+    """Matplotlib view of the rolling windows, updated in place on each refresh."""
+
+    colors = {"A": "blue", "B": "red", "C": "green"}
+
+    def __init__(self, tails, run_id, clock_mode="lamport"):
+        import matplotlib.pyplot as plt
+        self.plt = plt
+        plt.ion()
+        self.fig, self.axes = plt.subplots(3, 1, figsize=(10, 12), sharex=True)
+        self.fig.suptitle(f"Run {run_id} (live)")
+        self.lines = {}
+        ylabels = ["HLC Logical Counter", "HLC Drift from Wall Time (ms)", "Queue Length"] if clock_mode == "hlc" \
+            else ["Logical Clock", "Logical Clock Drift", "Queue Length"]
+        for ax, ylabel in zip(self.axes, ylabels):
+            ax.set_ylabel(ylabel)
+            ax.grid(True)
+        self.axes[2].set_xlabel("System Time")
+        for process in tails:
+            color = self.colors.get(process)
+            self.lines[process] = [ax.plot([], [], marker='.', markersize=1, linestyle='-', color=color, label=process)[0]
+                                   for ax in self.axes]
+        for ax in self.axes:
+            ax.legend(loc="upper left")
+
+    def render(self, tails):
+        for process, tail in tails.items():
+            clock_line, drift_line, queue_line = self.lines[process]
+            clock_line.set_data(tail.system_time, tail.logical_clock)
+            drift_line.set_data(tail.drift_time, tail.drift)
+            queue_line.set_data(tail.system_time, tail.queue_length)
+        for ax in self.axes:
+            ax.relim()
+            ax.autoscale_view()
+        self.fig.canvas.draw_idle()
+        self.plt.pause(0.001)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live view of a run in progress.")
+    parser.add_argument("run_id", type=int)
+    parser.add_argument("--mode", default="default", type=str, choices=["default", "small", "custom", "166"])
+    parser.add_argument("--clock", default="lamport", type=str, choices=["lamport", "hlc"], help="Clock mode the run uses")
+    parser.add_argument("--processes", default="ABC", help="Processes to follow (default: ABC)")
+    parser.add_argument("--interval", default=0.5, type=float, help="Seconds between refreshes")
+    parser.add_argument("--window", default=500, type=int, help="Samples kept per process")
+    parser.add_argument("--plot", action="store_true", help="Show a matplotlib window instead of the terminal view")
+    args = parser.parse_args()
+
+    hlc = args.clock == "hlc"
+    suffix = f"{'_' + args.mode if args.mode != 'default' else ''}{'_hlc' if hlc else ''}"
+    tails = {process: LogTail(f"log/{process}{args.run_id}{suffix}.log", args.window, hlc) for process in args.processes}
+    view = LivePlot(tails, args.run_id, args.clock) if args.plot else None
+
+    try:
+        while True:
+            st = time.time()
+            for tail in tails.values():
+                tail.poll()
+            record_drift(tails, st)
+            if view:
+                view.render(tails)
+            else:
+                render_terminal(tails, args.run_id, args.mode)
+            if all(tail.finished for tail in tails.values()):
+                print("All processes finished.")
+                break
+            time.sleep(max(0, args.interval - (time.time() - st)))
+    except KeyboardInterrupt:
+        pass
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13logical_clock.proto\x12\x0clogicalclock\"\"\n\rFinishRequest\x12\x11\n\tsender_id\x18\x01 \x01(\t\"%\n\x0e\x46inishResponse\x12\x13\n\x0bis_finished\x18\x01 \x01(\x08\"\x0e\n\x0cReadyRequest\"!\n\rReadyResponse\x12\x10\n\x08is_ready\x18\x01 \x01(\x08\"M\n\x0c\x43lockMessage\x12\x11\n\tsender_id\x18\x01 \x01(\t\x12\x15\n\rlogical_clock\x18\x02 \x01(\x02\x12\x13\n\x0bsystem_time\x18\x03 \x01(\x02\"\x16\n\x03\x41\x63k\x12\x0f\n\x07message\x18\x01 \x01(\t2\xdd\x01\n\x0c\x43lockService\x12\x45\n\nReadyCheck\x12\x1a.logicalclock.ReadyRequest\x1a\x1b.logicalclock.ReadyResponse\x12<\n\x0bSendMessage\x12\x1a.logicalclock.ClockMessage\x1a\x11.logicalclock.Ack\x12H\n\x0b\x46inishCheck\x12\x1b.logicalclock.FinishRequest\x1a\x1c.logicalclock.FinishResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13logical_clock.proto\x12\x0clogicalclock\"\"\n\rFinishRequest\x12\x11\n\tsender_id\x18\x01 \x01(\t\"%\n\x0e\x46inishResponse\x12\x13\n\x0bis_finished\x18\x01 \x01(\x08\"\x0e\n\x0cReadyRequest\"!\n\rReadyResponse\x12\x10\n\x08is_ready\x18\x01 \x01(\x08\"Z\n\x0c\x43lockMessage\x12\x11\n\tsender_id\x18\x01 \x01(\t\x12\x15\n\rlogical_clock\x18\x02 \x01(\x02\x12\x13\n\x0bsystem_time\x18\x03 \x01(\x02\x12\x0b\n\x03hlc\x18\x04 \x01(\x04\"\x16\n\x03\x41\x63k\x12\x0f\n\x07message\x18\x01 \x01(\t\"7\n\rMarkerMessage\x12\x11\n\tsender_id\x18\x01 \x01(\t\x12\x13\n\x0bsnapshot_id\x18\x02 \x01(\x03\"\x0e\n\x0cStatsRequest\"\x98\x02\n\rStatsResponse\x12\x12\n\nprocess_id\x18\x01 \x01(\t\x12\x0e\n\x06\x65vents\x18\x02 \x01(\x03\x12\r\n\x05sends\x18\x03 \x01(\x03\x12\x10\n\x08receives\x18\x04 \x01(\x03\x12\x11\n\tinternals\x18\x05 \x01(\x03\x12\x11\n\tjump_mean\x18\x06 \x01(\x01\x12\x15\n\rjump_variance\x18\x07 \x01(\x01\x12\x12\n\nqueue_mean\x18\x08 \x01(\x01\x12\x11\n\tqueue_max\x18\t \x01(\x03\x12\x11\n\tqueue_p50\x18\n \x01(\x01\x12\x11\n\tqueue_p90\x18\x0b \x01(\x01\x12\x11\n\tqueue_p99\x18\x0c \x01(\x01\x12\x12\n\ndrift_mean\x18\r \x01(\x01\x12\x11\n\tdrift_max\x18\x0e \x01(\x03\x32\xdc\x02\n\x0c\x43lockService\x12\x45\n\nReadyCheck\x12\x1a.logicalclock.ReadyRequest\x1a\x1b.logicalclock.ReadyResponse\x12<\n\x0bSendMessage\x12\x1a.logicalclock.ClockMessage\x1a\x11.logicalclock.Ack\x12H\n\x0b\x46inishCheck\x12\x1b.logicalclock.FinishRequest\x1a\x1c.logicalclock.FinishResponse\x12\x43\n\x08GetStats\x12\x1a.logicalclock.StatsRequest\x1a\x1b.logicalclock.StatsResponse\x12\x38\n\x06Marker\x12\x1b.logicalclock.MarkerMessage\x1a\x11.logicalclock.Ackb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -40,9 +40,15 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_READYRESPONSE']._serialized_start=128
   _globals['_READYRESPONSE']._serialized_end=161
   _globals['_CLOCKMESSAGE']._serialized_start=163
-  _globals['_CLOCKMESSAGE']._serialized_end=240
-  _globals['_ACK']._serialized_start=242
-  _globals['_ACK']._serialized_end=264
-  _globals['_CLOCKSERVICE']._serialized_start=267
-  _globals['_CLOCKSERVICE']._serialized_end=488
+  _globals['_CLOCKMESSAGE']._serialized_end=253
+  _globals['_ACK']._serialized_start=255
+  _globals['_ACK']._serialized_end=277
+  _globals['_MARKERMESSAGE']._serialized_start=279
+  _globals['_MARKERMESSAGE']._serialized_end=334
+  _globals['_STATSREQUEST']._serialized_start=336
+  _globals['_STATSREQUEST']._serialized_end=350
+  _globals['_STATSRESPONSE']._serialized_start=353
+  _globals['_STATSRESPONSE']._serialized_end=633
+  _globals['_CLOCKSERVICE']._serialized_start=636
+  _globals['_CLOCKSERVICE']._serialized_end=984
 # @@protoc_insertion_point(module_scope)
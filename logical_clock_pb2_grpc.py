@@ -49,6 +49,16 @@ class ClockServiceStub(object):
                 request_serializer=logical__clock__pb2.FinishRequest.SerializeToString,
                 response_deserializer=logical__clock__pb2.FinishResponse.FromString,
                 _registered_method=True)
+        self.GetStats = channel.unary_unary(
+                '/logicalclock.ClockService/GetStats',
+                request_serializer=logical__clock__pb2.StatsRequest.SerializeToString,
+                response_deserializer=logical__clock__pb2.StatsResponse.FromString,
+                _registered_method=True)
+        self.Marker = channel.unary_unary(
+                '/logicalclock.ClockService/Marker',
+                request_serializer=logical__clock__pb2.MarkerMessage.SerializeToString,
+                response_deserializer=logical__clock__pb2.Ack.FromString,
+                _registered_method=True)
 
 
 class ClockServiceServicer(object):
@@ -72,6 +82,18 @@ class ClockServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetStats(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Marker(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ClockServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -90,6 +112,16 @@ def add_ClockServiceServicer_to_server(servicer, server):
                     request_deserializer=logical__clock__pb2.FinishRequest.FromString,
                     response_serializer=logical__clock__pb2.FinishResponse.SerializeToString,
             ),
+            'GetStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetStats,
+                    request_deserializer=logical__clock__pb2.StatsRequest.FromString,
+                    response_serializer=logical__clock__pb2.StatsResponse.SerializeToString,
+            ),
+            'Marker': grpc.unary_unary_rpc_method_handler(
+                    servicer.Marker,
+                    request_deserializer=logical__clock__pb2.MarkerMessage.FromString,
+                    response_serializer=logical__clock__pb2.Ack.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'logicalclock.ClockService', rpc_method_handlers)
@@ -181,3 +213,57 @@ class ClockService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/logicalclock.ClockService/GetStats',
+            logical__clock__pb2.StatsRequest.SerializeToString,
+            logical__clock__pb2.StatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Marker(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/logicalclock.ClockService/Marker',
+            logical__clock__pb2.MarkerMessage.SerializeToString,
+            logical__clock__pb2.Ack.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
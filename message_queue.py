@@ -0,0 +1,103 @@
+import threading
+import time
+from array import array
+from queue import Empty
+
+class MessageQueue:
+    """Thread-safe FIFO of received messages, stored in a ring of typed arrays.
+
+    Each message is kept as a sender index (interned sender id), a clock value, and an
+    arrival time in three parallel arrays instead of as a tuple of Python objects, so a
+    deep backlog costs a few bytes per message. Exposes the parts of the queue.Queue
+    interface the VM uses, plus batch draining and a non-destructive `snapshot`.
+
+    Use clock_typecode "d" for Lamport clocks and "Q" for packed HLC timestamps, which do
+    not fit exactly in a double.
+    """
+
+    def __init__(self, clock_typecode="d", capacity=64):
+        self._senders = array("H", bytes(2 * capacity))
+        self._clocks = array(clock_typecode, bytes(array(clock_typecode).itemsize * capacity))
+        self._times = array("d", bytes(8 * capacity))
+        self._capacity = capacity
+        self._head = 0
+        self._size = 0
+        self._sender_index = {}
+        self._sender_names = []
+        self._not_empty = threading.Condition(threading.Lock())
+
+    def _grow(self):
+        """Doubles the capacity of a full ring, unrolling it so the oldest message is at index 0."""
+        head = self._head
+        for name in ("_senders", "_clocks", "_times"):
+            old = getattr(self, name)
+            new = old[head:] + old[:head]
+            new.frombytes(bytes(old.itemsize * self._capacity))
+            setattr(self, name, new)
+        self._capacity *= 2
+        self._head = 0
+
+    def put(self, item):
+        """Appends a (sender_id, clock, system_time) message."""
+        sender_id, clock, system_time = item
+        with self._not_empty:
+            index = self._sender_index.get(sender_id)
+            if index is None:
+                index = self._sender_index[sender_id] = len(self._sender_names)
+                self._sender_names.append(sender_id)
+            if self._size == self._capacity:
+                self._grow()
+            tail = (self._head + self._size) % self._capacity
+            self._senders[tail] = index
+            self._clocks[tail] = clock
+            self._times[tail] = system_time
+            self._size += 1
+            self._not_empty.notify()
+
+    def _pop(self):
+        head = self._head
+        item = (self._sender_names[self._senders[head]], self._clocks[head], self._times[head])
+        self._head = (head + 1) % self._capacity
+        self._size -= 1
+        return item
+
+    def get(self, block=True, timeout=None):
+        """Removes and returns the oldest message; raises queue.Empty like queue.Queue."""
+        with self._not_empty:
+            if not block:
+                if not self._size:
+                    raise Empty
+            elif timeout is None:
+                while not self._size:
+                    self._not_empty.wait()
+            else:
+                deadline = time.monotonic() + timeout
+                while not self._size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Empty
+                    self._not_empty.wait(remaining)
+            return self._pop()
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def get_batch(self, max_items=None):
+        """Removes and returns up to max_items messages (all if None) under a single lock acquisition."""
+        with self._not_empty:
+            count = self._size if max_items is None else min(max_items, self._size)
+            return [self._pop() for _ in range(count)]
+
+    def snapshot(self):
+        """Returns the queued messages in order without removing them."""
+        with self._not_empty:
+            return [
+                (self._sender_names[self._senders[j]], self._clocks[j], self._times[j])
+                for j in ((self._head + i) % self._capacity for i in range(self._size))
+            ]
+
+    def qsize(self):
+        return self._size
+
+    def empty(self):
+        return not self._size
@@ -0,0 +1,120 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+
+class LinkEmulator:
+    """Emulates one directed network link between two processes.
+
+    Messages handed to `submit` are delivered from a background thread after an injected
+    delay: a latency sample from the configured distribution, plus queueing behind earlier
+    messages when a bandwidth cap is set. Messages can be dropped or reordered at random,
+    except reliable ones (control traffic such as snapshot markers), which are never
+    dropped and are delivered after everything submitted before them. The delay actually
+    observed for every message is appended to `log_file`.
+    """
+
+    distributions = ("constant", "uniform", "normal", "exponential")
+
+    def __init__(self, name, latency_ms=0.0, jitter_ms=0.0, distribution="constant", bandwidth_kbps=None,
+                 loss=0.0, reorder=0.0, reorder_delay_ms=None, seed=None, log_file=None):
+        if distribution not in self.distributions:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.name = name
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.distribution = distribution
+        self.bandwidth = bandwidth_kbps * 1000 / 8 if bandwidth_kbps else None  # Bytes per second
+        self.loss = loss
+        self.reorder = reorder
+        # A reordered message is held back long enough for later ones to overtake it
+        self.reorder_delay = (reorder_delay_ms / 1000) if reorder_delay_ms is not None else self.latency + 2 * self.jitter
+        self.rng = random.Random(seed)
+        self.log_file = log_file
+
+        self._pending = []  # Heap of (deliver_at, seq, submitted_at, size, deliver)
+        self._seq = itertools.count()
+        self._link_free_at = 0.0  # When the bandwidth-capped link finishes sending queued bytes
+        self._last_in_order = 0.0  # Delivery time of the latest in-order message, keeps FIFO
+        self._last_scheduled = 0.0  # Latest delivery time of any message, including reordered ones
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._deliver_loop, daemon=True)
+        self._thread.start()
+
+    def sample_latency(self):
+        """Draws one propagation delay in seconds."""
+        if self.distribution == "uniform":
+            delay = self.rng.uniform(self.latency - self.jitter, self.latency + self.jitter)
+        elif self.distribution == "normal":
+            delay = self.rng.gauss(self.latency, self.jitter)
+        elif self.distribution == "exponential":
+            delay = self.latency + (self.rng.expovariate(1 / self.jitter) if self.jitter else 0.0)
+        else:
+            delay = self.latency
+        return max(0.0, delay)
+
+    def submit(self, size, deliver, reliable=False):
+        """Schedules `deliver()` to run after the emulated delay; returns False if the message is dropped.
+
+        A reliable message skips loss and reordering and is not delivered before any
+        message submitted earlier, even one that was held back for reordering.
+        """
+        now = time.time()
+        if not reliable and self.rng.random() < self.loss:
+            self._log(now, size, None, None, "DROPPED")
+            return False
+
+        with self._condition:
+            deliver_at = now
+            if self.bandwidth:
+                self._link_free_at = max(self._link_free_at, now) + size / self.bandwidth
+                deliver_at = self._link_free_at
+            deliver_at += self.sample_latency()
+
+            if reliable:
+                deliver_at = max(deliver_at, self._last_scheduled)
+                self._last_in_order = deliver_at
+            elif self.reorder and self.rng.random() < self.reorder:
+                deliver_at += self.reorder_delay
+            else:
+                deliver_at = max(deliver_at, self._last_in_order)
+                self._last_in_order = deliver_at
+            self._last_scheduled = max(self._last_scheduled, deliver_at)
+
+            heapq.heappush(self._pending, (deliver_at, next(self._seq), now, size, deliver))
+            self._condition.notify()
+        return True
+
+    def _deliver_loop(self):
+        while True:
+            with self._condition:
+                while not self._pending or self._pending[0][0] > time.time():
+                    if self._closed and not self._pending:
+                        return
+                    timeout = self._pending[0][0] - time.time() if self._pending else None
+                    self._condition.wait(timeout)
+                deliver_at, _, submitted_at, size, deliver = heapq.heappop(self._pending)
+
+            try:
+                deliver()
+                status = "DELIVERED"
+            except Exception as e:  # A failed delivery is recorded like a drop
+                status = f"FAILED {type(e).__name__}"
+            self._log(submitted_at, size, deliver_at - submitted_at, time.time() - submitted_at, status)
+
+    def _log(self, submitted_at, size, scheduled, actual, status):
+        if not self.log_file:
+            return
+        scheduled_ms = f"{scheduled * 1000:.3f}" if scheduled is not None else "-"
+        actual_ms = f"{actual * 1000:.3f}" if actual is not None else "-"
+        with open(self.log_file, "a") as log:
+            log.write(f"{self.name} | {submitted_at} | {size} | {scheduled_ms} | {actual_ms} | {status}\n")
+
+    def close(self, timeout=None):
+        """Stops accepting work and waits for already scheduled messages to be delivered."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout)
@@ -3,11 +3,15 @@ import argparse
 import numpy as np
 import os
 import re
+from hlc import unpack
 
 parser = argparse.ArgumentParser(description="Run a virtual machine process.")
 parser.add_argument("--mode", default="default", type=str, choices=["default", "small", "custom", "166"])
+parser.add_argument("--clock", default="lamport", type=str, choices=["lamport", "hlc"])
 args = parser.parse_args()
 mode = args.mode
+clock_mode = args.clock
+suffix = f"{'_' + mode if mode != 'default' else ''}{'_hlc' if clock_mode == 'hlc' else ''}"
 
 # Define process names and run IDs
 processes = ["A", "B", "C"]
@@ -16,6 +20,7 @@ runs = range(1, 11)
 # Regular expression patterns to extract log entries and clock rate
 log_pattern = re.compile(r"(.+?) \| ([\d.]+) \| (\d+) \| (\d+)")
 clock_rate_pattern = re.compile(r"Clock Rate: (\d+) ticks per second")
+hlc_log_pattern = re.compile(r"(.+?) \| ([\d.]+) \| (\d+) \| (\d+) \| (-?\d+)")
 
 # Function to read log file and extract data
 def read_log(file_path):
@@ -40,6 +45,57 @@ def read_log(file_path):
 
     return system_time, logical_clock, queue_length, clock_rate
 
+# Function to read an hlc-mode log file, which also records drift from wall time
+def read_hlc_log(file_path):
+    system_time = []
+    hlc_counter = []
+    drift = []
+    queue_length = []
+    clock_rate = None
+
+    with open(file_path, "r") as file:
+        for line in file:
+            if clock_rate is None:  # Extract clock rate from the first line
+                match_clock = clock_rate_pattern.match(line.strip())
+                if match_clock:
+                    clock_rate = int(match_clock.group(1))
+
+            match = hlc_log_pattern.match(line.strip())
+            if match:
+                event_type, sys_time, queue_len, hlc, hlc_drift = match.groups()
+                system_time.append(float(sys_time))
+                queue_length.append(int(queue_len))
+                hlc_counter.append(unpack(int(hlc))[1])
+                drift.append(int(hlc_drift))
+
+    return system_time, hlc_counter, drift, queue_length, clock_rate
+
+# Function to plot the HLC logical counter, HLC drift from wall time, and queue length
+def plot_hlc_graphs(series, clock_rates, filename):
+    fig, axes = plt.subplots(3, 1, figsize=(10, 15), sharex=True)
+    colors = {"A": "blue", "B": "red", "C": "green"}
+    titles = [
+        ("HLC Logical Counter", "HLC Logical Counter Over Time"),
+        ("HLC Drift (ms)", "HLC Drift vs Wall Time"),
+        ("Queue Length", "Queue Length Over Time"),
+    ]
+
+    for process, sys_time, counter, drift, queue_length in series:
+        label = f"{process} (Clock Rate: {clock_rates[process]})"
+        for ax, y_values in zip(axes, [counter, drift, queue_length]):
+            ax.plot(sys_time, y_values, marker='.', markersize=1, linestyle='-', color=colors[process], label=label)
+
+    for ax, (ylabel, title) in zip(axes, titles):
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        ax.legend()
+        ax.grid(True)
+    axes[2].set_xlabel("System Time")
+
+    plt.tight_layout()
+    plt.savefig(filename)
+    plt.close()
+
 # Function to plot all three graphs into one figure
 def plot_combined_graphs(system_times_logical, system_times_queue, clock_rates, filename):
     fig, axes = plt.subplots(3, 1, figsize=(10, 15), sharex=True)
@@ -96,12 +152,19 @@ def plot_combined_graphs(system_times_logical, system_times_queue, clock_rates,
 for run_id in runs:
     system_times_logical = []
     system_times_queue = []
+    hlc_series = []
     clock_rates = {}
 
     for process in processes:
-        log_file = f"log/{process}{run_id}{'_' + mode if mode != 'default' else ''}.log"
+        log_file = f"log/{process}{run_id}{suffix}.log"
 
-        if os.path.exists(log_file):
+        if os.path.exists(log_file) and clock_mode == "hlc":
+            system_time, hlc_counter, drift, queue_length, clock_rate = read_hlc_log(log_file)
+            hlc_series.append((process, system_time, hlc_counter, drift, queue_length))
+            clock_rates[process] = clock_rate
+
+            print(f"Processed {log_file} with Clock Rate: {clock_rate}")
+        elif os.path.exists(log_file):
             system_time, logical_clock, queue_length, clock_rate = read_log(log_file)
 
             # Store system times and values for plotting
@@ -114,7 +177,11 @@ for run_id in runs:
             print(f"Log file {log_file} not found, skipping.")
 
     # Generate one PDF file per run, stacking all three graphs
-    if system_times_logical and system_times_queue:
-        output_file = f"plots/combined_plot_{run_id}{'_' + mode if mode != 'default' else ''}.pdf"
+    if hlc_series:
+        output_file = f"plots/combined_plot_{run_id}{suffix}.pdf"
+        plot_hlc_graphs(hlc_series, clock_rates, output_file)
+        print(f"Saved combined plot: {output_file}")
+    elif system_times_logical and system_times_queue:
+        output_file = f"plots/combined_plot_{run_id}{suffix}.pdf"
         plot_combined_graphs(system_times_logical, system_times_queue, clock_rates, output_file)
         print(f"Saved combined plot: {output_file}")
@@ -0,0 +1,146 @@
+import contextlib
+import cProfile
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+class PhaseTimer:
+    """Accumulates wall time per named phase (count, total, max) across threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phases = {}
+
+    @contextlib.contextmanager
+    def phase(self, name, budget=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, budget)
+
+    def record(self, name, seconds, budget=None):
+        """Adds one timing; with a budget, also counts how often it was exceeded."""
+        with self._lock:
+            entry = self.phases.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "over_budget": 0})
+            entry["count"] += 1
+            entry["total_ms"] += seconds * 1000
+            entry["max_ms"] = max(entry["max_ms"], seconds * 1000)
+            if budget is not None and seconds > budget:
+                entry["over_budget"] += 1
+
+    def summary(self):
+        with self._lock:
+            return {
+                name: {**entry, "mean_ms": entry["total_ms"] / entry["count"]}
+                for name, entry in self.phases.items()
+            }
+
+class StackSampler:
+    """Samples the stacks of all threads at a fixed interval, including gRPC handler threads.
+
+    Writes folded stacks ("frame;frame;frame count"), the input format of flamegraph tools.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+class Profiler:
+    """Opt-in profiling for one VirtualMachine; each mode writes an artifact next to the log.
+
+    Modes: "cprofile" (tick loop thread), "sample" (all threads), "tracemalloc", and
+    "phases" (per-phase timers). Without "phases", `phase` and `record` are no-ops.
+    """
+
+    modes = ("cprofile", "sample", "tracemalloc", "phases")
+
+    def __init__(self, modes, artifact_base):
+        self.enabled = set(modes or ())
+        unknown = self.enabled - set(self.modes)
+        if unknown:
+            raise ValueError(f"Unknown profiling modes: {', '.join(sorted(unknown))}")
+        self.artifact_base = artifact_base
+        self.timer = PhaseTimer() if "phases" in self.enabled else None
+        self._cprofile = None
+        self._sampler = None
+
+    def phase(self, name, budget=None):
+        return self.timer.phase(name, budget) if self.timer else contextlib.nullcontext()
+
+    def record(self, name, seconds, budget=None):
+        if self.timer:
+            self.timer.record(name, seconds, budget)
+
+    def start(self):
+        if "tracemalloc" in self.enabled:
+            tracemalloc.start(25)
+        if "sample" in self.enabled:
+            self._sampler = StackSampler()
+            self._sampler.start()
+        if "cprofile" in self.enabled:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop(self):
+        """Stops all profilers and writes their artifacts; returns the paths written."""
+        written = []
+        if self._cprofile:
+            self._cprofile.disable()
+            path = f"{self.artifact_base}.cprofile.pstats"
+            self._cprofile.dump_stats(path)
+            written.append(path)
+        if self._sampler:
+            self._sampler.stop()
+            path = f"{self.artifact_base}.samples.folded"
+            self._sampler.write(path)
+            written.append(path)
+        if "tracemalloc" in self.enabled and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            snapshot.dump(f"{self.artifact_base}.tracemalloc")
+            path = f"{self.artifact_base}.tracemalloc.txt"
+            with open(path, "w") as f:
+                f.write(f"Current: {current} bytes | Peak: {peak} bytes\n")
+                for stat in snapshot.statistics("lineno")[:50]:
+                    f.write(f"{stat}\n")
+            written.extend([f"{self.artifact_base}.tracemalloc", path])
+        if self.timer:
+            path = f"{self.artifact_base}.phases.json"
+            with open(path, "w") as f:
+                json.dump(self.timer.summary(), f, indent=2)
+            written.append(path)
+        return written
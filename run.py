@@ -2,11 +2,21 @@ import grpc
 from concurrent import futures
 import time
 import threading
-import queue
 import random
 import logical_clock_pb2
 import logical_clock_pb2_grpc
 import argparse
+import os
+import re
+from stats import EventStats
+from hlc import HybridLogicalClock, to_ms
+from snapshot import LocalSnapshot, snapshot_path, load_snapshot
+from netem import LinkEmulator
+from profiling import Profiler
+from message_queue import MessageQueue
+
+# Regular expression pattern to extract log entries when rebuilding statistics on restore
+log_pattern = re.compile(r"(.+?) \| ([\d.]+) \| (\d+) \| (\d+)(?: \| (-?\d+))?")
 
 config = {
     "default": {
@@ -67,6 +77,27 @@ config = {
     }
 }
 
+# Network emulation profiles: "default" applies to every link, "X->Y" entries override a single link
+netem_config = {
+    "lan": {
+        "default": {"latency_ms": 0.5, "jitter_ms": 0.2, "distribution": "normal"},
+    },
+    "wan": {
+        "default": {"latency_ms": 40, "jitter_ms": 10, "distribution": "normal", "bandwidth_kbps": 1000},
+    },
+    "lossy": {
+        "default": {"latency_ms": 20, "jitter_ms": 20, "distribution": "exponential", "loss": 0.05, "reorder": 0.05},
+    },
+    "congested": {
+        "default": {"latency_ms": 5, "jitter_ms": 2, "distribution": "uniform", "bandwidth_kbps": 8},
+    },
+    "asymmetric": {
+        "default": {"latency_ms": 1, "jitter_ms": 0.5, "distribution": "normal"},
+        "B->A": {"latency_ms": 300, "jitter_ms": 100, "distribution": "normal"},
+        "C->A": {"latency_ms": 300, "jitter_ms": 100, "distribution": "normal"},
+    },
+}
+
 class ClockService(logical_clock_pb2_grpc.ClockServiceServicer):
     """Handles incoming messages and updates logical clock."""
 
@@ -85,50 +116,131 @@ class ClockService(logical_clock_pb2_grpc.ClockServiceServicer):
     def SendMessage(self, request, context):
         """Handles received messages and places them in the event queue."""
         system_time = time.time()
-        self.process.event_queue.put((request.sender_id, request.logical_clock, system_time))
+        received_clock = request.hlc if self.process.clock_mode == "hlc" else request.logical_clock
+        with self.process.profiler.phase("rpc_send_message"):
+            with self.process.snapshot_lock:  # Message lands either in the recorded queue or in the channel state
+                self.process.event_queue.put((request.sender_id, received_clock, system_time))
+                self.process.record_in_flight(request.sender_id, received_clock, system_time)
+        return logical_clock_pb2.Ack(message=f"Ack from {self.process.process_id}")
+
+    def Marker(self, request, context):
+        """Handles a Chandy-Lamport snapshot marker from a peer."""
+        with self.process.profiler.phase("rpc_marker"):
+            self.process.handle_marker(request.sender_id, request.snapshot_id)
         return logical_clock_pb2.Ack(message=f"Ack from {self.process.process_id}")
 
+    def GetStats(self, request, context):
+        """Returns the live running statistics of this process."""
+        summary = self.process.stats.summary()
+        return logical_clock_pb2.StatsResponse(
+            process_id=self.process.process_id,
+            events=summary["events"],
+            sends=summary["sends"],
+            receives=summary["receives"],
+            internals=summary["internals"],
+            jump_mean=summary["jump_mean"],
+            jump_variance=summary["jump_variance"],
+            queue_mean=summary["queue_mean"],
+            queue_max=summary["queue_max"],
+            queue_p50=summary["queue_p50"],
+            queue_p90=summary["queue_p90"],
+            queue_p99=summary["queue_p99"],
+            drift_mean=summary["drift_mean"],
+            drift_max=summary["drift_max"],
+        )
+
 class VirtualMachine:
     """Represents a logical machine with a clock and gRPC server/client."""
 
-    def __init__(self, process_id, port, num_to_port, run_id, port_mapping, mode):
+    def __init__(self, process_id, port, num_to_port, run_id, port_mapping, mode, clock_mode="lamport", snapshot_interval=None, restore_snapshot=None, netem=None, netem_seed=None, profile=None,
+                 duration=65, log_dir="log", clock_rate=None, max_action=None, poll_interval=1, connect=True):
         self.process_id = process_id
-        self.port = port
-        self.num_to_port = num_to_port
-        self.logical_clock = 0
-        self.clock_rate = config[mode][self.process_id]["clock_rate"]
-        self.event_queue = queue.Queue()
+        self.port = port  # "0" lets the OS pick a free port; self.port is updated once bound
+        self.logical_clock = 0  # Lamport counter, or the packed HLC timestamp in hlc mode
+        self.clock_mode = clock_mode
+        self.hlc = HybridLogicalClock() if clock_mode == "hlc" else None
+        self.clock_rate = clock_rate if clock_rate is not None else config[mode][self.process_id]["clock_rate"]
+        self.max_action = max_action if max_action is not None else config[mode][self.process_id]["max_action"]
+        self.event_queue = MessageQueue("Q" if self.hlc else "d")  # Compact array-backed FIFO
         self.mode = mode
-        self.log_file = f"log/{process_id}{run_id}{'_' + self.mode if self.mode != 'default' else ''}.log"
+        self.log_file = f"{log_dir}/{process_id}{run_id}{'_' + self.mode if self.mode != 'default' else ''}{'_hlc' if clock_mode == 'hlc' else ''}.log"
+        self.summary_file = os.path.splitext(self.log_file)[0] + ".summary.json"
+        self.stats = EventStats()  # O(1)-memory running statistics, see GetStats
+        self.profiler = Profiler(profile, os.path.splitext(self.log_file)[0])  # No-op unless modes are given
         self.is_finished = False
-        self.port_to_process = {v: k for k, v in port_mapping.items()}
+        self.poll_interval = poll_interval  # Seconds between readiness/finish checks
+
+        # Chandy-Lamport snapshot state. The tick loop holds state_lock for each event, so a
+        # snapshot sees a consistent clock, queue, and log; snapshot_lock orders arriving
+        # messages against the moment the local state is recorded.
+        self.state_lock = threading.RLock()
+        self.snapshot_lock = threading.Lock()
+        self.snapshot_interval = snapshot_interval  # Seconds between snapshots this process initiates
+        self.active_snapshots = {}  # Snapshot id -> LocalSnapshot still waiting for markers
+        self.last_snapshot_id = 0
+        self.snapshot_metrics = []  # (pause_ms, bytes_written) per completed snapshot
+        self.duration = duration  # Seconds; 65 runs for 1 minute and 5 seconds
+        self.start_time = None
+        self.restored_elapsed = None
+
+        # Emulated links to each peer (built in set_peers); without a profile messages are sent directly
+        self.netem = netem
+        self.netem_seed = netem_seed
+        self.netem_file = os.path.splitext(self.log_file)[0] + ".netem.txt"
+        self.links = {}
+
+        if restore_snapshot is not None:
+            self.restore(restore_snapshot)  # Before serving, so no new message overtakes restored ones
+        else:
+            # Before serving too: a marker can arrive before run() starts, and its snapshot must
+            # record an offset into this run's log rather than into an older one with the same id
+            self.write_log_header()
         
         # Create ClockService instance and share it with gRPC
         self.service = ClockService(self)
+        self.start_server()
 
-        # Start the gRPC server in a separate thread
-        server_thread = threading.Thread(target=self.start_server)
-        server_thread.daemon = True
-        server_thread.start()
-
-        time.sleep(2)  # Allow server to start before processing
-
-        # Wait until all processes are ready
-        self.wait_for_all_servers_ready()
+        # Wait until all processes are ready. With connect=False the caller learns self.port
+        # first and calls connect() once every peer's port is known.
+        if connect:
+            self.connect(num_to_port, port_mapping)
 
     def start_server(self):
         """Initializes and starts the gRPC server."""
-        server = grpc.server(futures.ThreadPoolExecutor(max_workers=3))
-        service = ClockService(self)
-        logical_clock_pb2_grpc.add_ClockServiceServicer_to_server(service, server)
-        server.add_insecure_port(f"[::]:{self.port}")
-        server.start()
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))  # Marker handlers block on peer RPCs
+        logical_clock_pb2_grpc.add_ClockServiceServicer_to_server(self.service, self.server)
+        self.port = str(self.server.add_insecure_port(f"[::]:{self.port}"))
+        self.server.start()
 
         # Mark the service as ready
-        service.is_ready = True
+        self.service.is_ready = True
 
         print(f"{self.process_id} Server started on port {self.port}...")
-        server.wait_for_termination()
+
+    def set_peers(self, num_to_port, port_mapping):
+        """Records where peers listen and builds the emulated links to them."""
+        self.num_to_port = num_to_port
+        self.port_to_process = {v: k for k, v in port_mapping.items()}
+        self.peers = [p for p in port_mapping if p != self.process_id]
+
+        if self.netem:
+            for target in self.num_to_port.values():
+                name = f"{self.process_id}->{self.port_to_process[target]}"
+                params = {**netem_config[self.netem]["default"], **netem_config[self.netem].get(name, {})}
+                seed = None if self.netem_seed is None else f"{self.netem_seed}:{name}"
+                self.links[target] = LinkEmulator(name, seed=seed, log_file=self.netem_file, **params)
+            with open(self.netem_file, "w") as log:
+                log.write(f"Netem Profile: {self.netem}\n")
+                log.write("link | submitted | bytes | scheduled ms | actual ms | status\n")
+
+    def connect(self, num_to_port, port_mapping):
+        """Sets the peers and waits at the readiness barrier until all of them serve."""
+        self.set_peers(num_to_port, port_mapping)
+        self.wait_for_all_servers_ready()
+
+    def stop(self):
+        """Stops serving. Only call once every peer has finished waiting on this process."""
+        self.server.stop(grace=None)
 
     def wait_for_all_servers_ready(self):
         """Waits until all other processes report they are ready."""
@@ -136,7 +248,7 @@ class VirtualMachine:
 
         all_ready = False
         while not all_ready:
-            time.sleep(1)  # Avoid spamming requests
+            time.sleep(self.poll_interval)  # Avoid spamming requests
             all_ready = True
             for target_port in self.num_to_port.values():
                 try:
@@ -156,7 +268,7 @@ class VirtualMachine:
         print(f"{self.process_id} waiting for all processes to finish...")
 
         while True:
-            time.sleep(1)  # Avoid spamming requests
+            time.sleep(self.poll_interval)  # Avoid spamming requests
             all_finished = True  # Assume all are finished unless proven otherwise
 
             for target_port in self.num_to_port.values():
@@ -178,76 +290,278 @@ class VirtualMachine:
 
         print(f"{self.process_id} detected all processes have finished. Shutting down...")
 
+    def write_log_header(self):
+        """Starts a fresh log for this run."""
+        with open(self.log_file, "w") as log:
+            log.write(f"Clock Rate: {self.clock_rate} ticks per second\n")
+            if self.hlc:
+                log.write("Clock Mode: hlc\n")
+            log.write(f"{'-' * 40}\n")  # Add a separator for clarity
+
     def log_event(self, event_type, system_time, queue_length):
         """Logs all events in a single file per process."""
-        with open(self.log_file, "a") as log:
-            log.write(f"{event_type} | {system_time} | {queue_length} | {self.logical_clock}\n")
+        with self.profiler.phase("log"):
+            self.write_log_line(event_type, system_time, queue_length)
+
+    def write_log_line(self, event_type, system_time, queue_length):
+        """Appends one event to the log and folds it into the running statistics."""
+        if self.hlc:
+            # Packed HLC in the clock column, followed by its drift from wall time in ms
+            drift = self.hlc.drift_ms(system_time)
+            with open(self.log_file, "a") as log:
+                log.write(f"{event_type} | {system_time} | {queue_length} | {self.logical_clock} | {drift}\n")
+            self.stats.update(event_type, queue_length, to_ms(self.logical_clock), drift)
+        else:
+            with open(self.log_file, "a") as log:
+                log.write(f"{event_type} | {system_time} | {queue_length} | {self.logical_clock}\n")
+            self.stats.update(event_type, queue_length, self.logical_clock)
+
+    def tick_clock(self):
+        """Advances the clock for a local or send event."""
+        if self.hlc:
+            self.logical_clock = self.hlc.tick()
+        else:
+            self.logical_clock += 1
 
     def process_message(self, sender_id, received_clock, system_time):
         """Processes a received message and updates logical clock."""
-        print("Old local clock:", self.logical_clock, "Received clock:", received_clock, "New logical clock:", max(self.logical_clock, received_clock) + 1)
-        self.logical_clock = max(self.logical_clock, received_clock) + 1
+        old_clock = self.logical_clock
+        if self.hlc:
+            self.logical_clock = self.hlc.receive(received_clock)
+        else:
+            self.logical_clock = max(self.logical_clock, received_clock) + 1
+        print("Old local clock:", old_clock, "Received clock:", received_clock, "New logical clock:", self.logical_clock)
         queue_length = self.event_queue.qsize()
         self.log_event(f"RECEIVE {sender_id}", system_time, queue_length)
 
-    def send_message(self, target_port):
-        """Sends a logical clock message to another process."""
+    def transmit(self, target_port, method, request, reliable=False):
+        """Calls a peer RPC directly, or hands it to the emulated link if there is one."""
         channel = grpc.insecure_channel(f"localhost:{target_port}")
         stub = logical_clock_pb2_grpc.ClockServiceStub(channel)
+        link = self.links.get(target_port)
+        if link:
+            # Reliable traffic is never dropped and never overtakes earlier messages on the link
+            link.submit(request.ByteSize(), lambda: getattr(stub, method)(request), reliable)
+            return None
+        return getattr(stub, method)(request)
+
+    def send_message(self, target_port):
+        """Sends a logical clock message to another process."""
         message = logical_clock_pb2.ClockMessage(
             sender_id=self.process_id,
-            logical_clock=self.logical_clock,
-            system_time=time.time()
+            logical_clock=0 if self.hlc else self.logical_clock,
+            system_time=time.time(),
+            hlc=self.logical_clock if self.hlc else 0
         )
-        response = stub.SendMessage(message)
-        print(f"{self.process_id} -> Sent message to {target_port} | LC: {self.logical_clock} | Response: {response.message}")
+        with self.profiler.phase("send"):
+            response = self.transmit(target_port, "SendMessage", message)
+        print(f"{self.process_id} -> Sent message to {target_port} | LC: {self.logical_clock} | Response: {response.message if response else 'emulated link'}")
+
+    def record_in_flight(self, sender_id, received_clock, system_time):
+        """Adds a message to the channel state of every snapshot in progress. Caller holds snapshot_lock."""
+        for snapshot in self.active_snapshots.values():
+            snapshot.record_message(sender_id, received_clock, system_time)
+
+    def initiate_snapshot(self):
+        """Starts a new global snapshot from this process."""
+        with self.snapshot_lock:
+            if self.active_snapshots:
+                return  # Previous snapshot has not completed yet
+            snapshot_id = self.last_snapshot_id + 1
+        self.record_and_send_markers(snapshot_id)
+
+    def handle_marker(self, sender_id, snapshot_id):
+        """Records local state on the first marker of a snapshot, otherwise closes the sender's channel."""
+        with self.snapshot_lock:
+            needs_recording = snapshot_id > self.last_snapshot_id
+        if needs_recording and self.record_and_send_markers(snapshot_id, sender_id):
+            return
+
+        # Not the first marker of this snapshot: it only closes the sender's channel
+        with self.snapshot_lock:
+            snapshot = self.active_snapshots.get(snapshot_id)
+            if snapshot is None:
+                return  # Stale marker from a snapshot that already completed
+            snapshot.close_channel(sender_id)
+            completed = self.complete_snapshot_if_done(snapshot)
+        if completed:
+            self.write_snapshot(completed)
+
+    def record_and_send_markers(self, snapshot_id, trigger_sender=None):
+        """Records the local state, then sends markers before any further message can be sent.
+
+        Returns False if the snapshot was already recorded. A marker for the next snapshot
+        can arrive while this process still waits for the last markers of the previous
+        one, so several snapshots may be in progress at once.
+        """
+        with self.state_lock:
+            paused_at = time.time()
+            with self.snapshot_lock:
+                if snapshot_id <= self.last_snapshot_id:
+                    return False  # A concurrent marker recorded first
+                pending = self.event_queue.snapshot()
+                state = {
+                    "process_id": self.process_id,
+                    "logical_clock": self.logical_clock,
+                    "clock_rate": self.clock_rate,
+                    "max_action": self.max_action,
+                    "event_queue": pending,
+                    "log_offset": os.path.getsize(self.log_file) if os.path.exists(self.log_file) else 0,
+                    "elapsed": time.time() - self.start_time if self.start_time else 0.0,
+                }
+                snapshot = LocalSnapshot(snapshot_id, self.peers, state)
+                if trigger_sender:
+                    snapshot.close_channel(trigger_sender)  # Nothing is in flight behind the first marker
+                self.active_snapshots[snapshot_id] = snapshot
+                self.last_snapshot_id = snapshot_id
+
+            for target in self.num_to_port.values():
+                try:
+                    # Markers are control traffic: a lost marker would leave the snapshot open forever
+                    self.transmit(target, "Marker", logical_clock_pb2.MarkerMessage(sender_id=self.process_id, snapshot_id=snapshot_id), reliable=True)
+                except grpc.RpcError:
+                    print(f"{self.process_id} could not send marker {snapshot_id} to {target}")
+            snapshot.pause_time = time.time() - paused_at
+
+            with self.snapshot_lock:
+                snapshot.markers_sent = True
+                completed = self.complete_snapshot_if_done(snapshot)
+        if completed:
+            self.write_snapshot(completed)
+        return True
+
+    def complete_snapshot_if_done(self, snapshot):
+        """Detaches a snapshot once its markers are sent and received. Caller holds snapshot_lock."""
+        if snapshot.markers_sent and not snapshot.open_channels:
+            del self.active_snapshots[snapshot.snapshot_id]
+            return snapshot
+        return None
+
+    def write_snapshot(self, snapshot):
+        """Writes a completed local snapshot and records its overhead."""
+        bytes_written = snapshot.write(snapshot_path(self.log_file, snapshot.snapshot_id))
+        self.snapshot_metrics.append((snapshot.pause_time * 1000, bytes_written))
+        print(f"{self.process_id} completed snapshot {snapshot.snapshot_id} | pause: {snapshot.pause_time * 1000:.2f} ms | bytes: {bytes_written}")
+
+    def restore(self, snapshot_id):
+        """Restores clock, rate, pending messages, log, and statistics from a completed snapshot."""
+        snapshot = load_snapshot(self.log_file, snapshot_id)
+        self.logical_clock = snapshot["logical_clock"]
+        # "default" and "small" draw random rates at startup; keep the ones the run was using
+        self.clock_rate = snapshot.get("clock_rate", self.clock_rate)
+        self.max_action = snapshot.get("max_action", self.max_action)
+        if self.hlc:
+            self.hlc.timestamp = self.logical_clock
+
+        # Messages queued at the snapshot come first, then those that were in flight
+        for message in snapshot["event_queue"]:
+            self.event_queue.put(tuple(message))
+        in_flight = [(sender_id, clock, system_time) for sender_id, messages in snapshot["channels"].items()
+                     for clock, system_time in messages]
+        for message in sorted(in_flight, key=lambda m: m[2]):
+            self.event_queue.put(message)
+
+        # Drop log lines written after the snapshot and rebuild the statistics from the rest
+        with open(self.log_file, "r+") as log:
+            log.truncate(snapshot["log_offset"])
+        with open(self.log_file, "r") as log:
+            for line in log:
+                match = log_pattern.match(line.strip())
+                if match:
+                    event_type, _, queue_len, log_clock, drift = match.groups()
+                    if self.hlc:
+                        self.stats.update(event_type, int(queue_len), to_ms(int(log_clock)), int(drift))
+                    else:
+                        self.stats.update(event_type, int(queue_len), int(log_clock))
+
+        self.last_snapshot_id = snapshot_id
+        self.restored_elapsed = snapshot["elapsed"]
+        print(f"{self.process_id} restored snapshot {snapshot_id} at {self.restored_elapsed:.2f}s | LC: {self.logical_clock} | rate: {self.clock_rate} | queued: {self.event_queue.qsize()}")
 
     def run(self):
         """Main event loop: process messages or generate events based on clock rate."""
-        with open(self.log_file, "w") as log:
-            log.write(f"Clock Rate: {self.clock_rate} ticks per second\n")
-            log.write(f"{'-' * 40}\n")  # Add a separator for clarity
-
-        start_time = time.time()
-        duration = 65  # Run for 1 minute and 5 seconds
-        while time.time() - start_time < duration:
+        if self.restored_elapsed is None:
+            self.start_time = time.time()
+        else:
+            self.start_time = time.time() - self.restored_elapsed  # Continue where the snapshot left off
+
+        self.profiler.start()
+        budget = 1 / self.clock_rate
+        last_snapshot = time.time()
+        while time.time() - self.start_time < self.duration:
             st = time.time()
-            if not self.event_queue.empty():
-                sender_id, received_clock, system_time = self.event_queue.get()
-                # self.process_message(sender_id, received_clock, system_time)  # bug
-                self.process_message(sender_id, received_clock, time.time())
-            else:
-                action = random.randint(1, config[mode][self.process_id]['max_action'])
-                if action < 3:  # Send to one machine (action is 1 or 2)
-                    target = num_to_port[action]
-                    target_process = self.port_to_process[target]
-                    self.logical_clock += 1
-                    self.send_message(target)
-                    self.log_event(f"SEND {target_process}", time.time(), self.event_queue.qsize())
-
-                elif action == 3:  # Send to both machines
-                    self.logical_clock += 1
-                    for target in self.num_to_port.values():
-                        self.send_message(target)
-                    self.log_event("SEND ALL", time.time(), self.event_queue.qsize())
-
-                else:  # Internal event
-                    self.logical_clock += 1
-                    self.log_event("INTERNAL", time.time(), self.event_queue.qsize())
-            time.sleep((1 / self.clock_rate) - (time.time() - st))
+            if self.snapshot_interval and st - last_snapshot >= self.snapshot_interval:
+                last_snapshot = st
+                with self.profiler.phase("snapshot"):
+                    self.initiate_snapshot()
+            tick_start = time.perf_counter()  # Snapshots are timed separately, not against the tick budget
+            with self.state_lock:
+                self.profiler.record("lock_wait", time.perf_counter() - tick_start)
+                self.tick()
+            self.profiler.record("tick", time.perf_counter() - tick_start, budget)
+            time.sleep(max(0, (1 / self.clock_rate) - (time.time() - st)))
         
         # Mark this process as finished
         self.is_finished = True
         print(f"{self.process_id} has finished execution.")
+        for path in self.profiler.stop():
+            print(f"{self.process_id} wrote profile {path}")
+
+        # Persist the running statistics so summary tables need not re-read the log
+        pauses = [pause for pause, _ in self.snapshot_metrics]
+        self.stats.write_summary(
+            self.summary_file, process_id=self.process_id, clock_rate=self.clock_rate, mode=self.mode, clock_mode=self.clock_mode,
+            snapshots=len(self.snapshot_metrics),
+            snapshot_pause_ms_mean=sum(pauses) / len(pauses) if pauses else 0.0,
+            snapshot_pause_ms_max=max(pauses, default=0.0),
+            snapshot_bytes=sum(size for _, size in self.snapshot_metrics),
+        )
+        print(f"{self.process_id} wrote summary to {self.summary_file}")
 
         # Wait for all other processes to finish
         self.wait_for_all_to_finish()
+        for link in self.links.values():
+            link.close(timeout=5)
+
+    def tick(self):
+        """Handles one clock tick: process a queued message or generate an event."""
+        if not self.event_queue.empty():
+            with self.profiler.phase("dequeue"):
+                sender_id, received_clock, system_time = self.event_queue.get()
+            # self.process_message(sender_id, received_clock, system_time)  # bug
+            self.process_message(sender_id, received_clock, time.time())
+        else:
+            with self.profiler.phase("action_draw"):
+                action = random.randint(1, self.max_action)
+            if action <= len(self.num_to_port):  # Send to one machine (action is 1 or 2 with three processes)
+                target = self.num_to_port[action]
+                target_process = self.port_to_process[target]
+                self.tick_clock()
+                self.send_message(target)
+                self.log_event(f"SEND {target_process}", time.time(), self.event_queue.qsize())
+
+            elif action == len(self.num_to_port) + 1:  # Send to all other machines
+                self.tick_clock()
+                for target in self.num_to_port.values():
+                    self.send_message(target)
+                self.log_event("SEND ALL", time.time(), self.event_queue.qsize())
+
+            else:  # Internal event
+                self.tick_clock()
+                self.log_event("INTERNAL", time.time(), self.event_queue.qsize())
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run a virtual machine process.")
     parser.add_argument("process_id", choices=["A", "B", "C"], help="Process ID (A, B, or C)")
     parser.add_argument("run_id", type=int)
     parser.add_argument("--mode", default="default", type=str, choices=["default", "small", "custom", "166"])
+    parser.add_argument("--clock", default="lamport", type=str, choices=["lamport", "hlc"], help="Logical clock algorithm")
+    parser.add_argument("--snapshot-interval", default=None, type=float, help="Seconds between global snapshots initiated by this process")
+    parser.add_argument("--restore", default=None, type=int, help="Snapshot id to restart the run from")
+    parser.add_argument("--netem", default=None, type=str, choices=list(netem_config), help="Network emulation profile for outgoing links")
+    parser.add_argument("--netem-seed", default=None, type=int, help="Seed for reproducible emulated delays and drops")
+    parser.add_argument("--duration", default=65, type=float, help="Seconds to run")
+    parser.add_argument("--profile", nargs="+", default=None, choices=Profiler.modes, help="Profilers to run; artifacts are written next to the log")
     args = parser.parse_args()
     process_id = args.process_id
     run_id = args.run_id
@@ -260,5 +574,9 @@ if __name__ == "__main__":
 
     num_to_port = {1: all_ports[(my_index)-2], 2: peer_ports[(my_index -1)]} # Maps action num to peer port to send to
 
-    vm = VirtualMachine(process_id, port_mapping[process_id], num_to_port, run_id, port_mapping, mode)
+    vm = VirtualMachine(
+        process_id, port_mapping[process_id], num_to_port, run_id, port_mapping, mode,
+        clock_mode=args.clock, snapshot_interval=args.snapshot_interval, restore_snapshot=args.restore,
+        netem=args.netem, netem_seed=args.netem_seed, profile=args.profile, duration=args.duration,
+    )
     vm.run()
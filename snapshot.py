@@ -0,0 +1,51 @@
+import json
+import os
+import time
+
+def snapshot_path(log_file, snapshot_id):
+    """Where a process stores its part of a global snapshot, next to its log."""
+    return f"{os.path.splitext(log_file)[0]}.snapshot-{snapshot_id}.json"
+
+def load_snapshot(log_file, snapshot_id):
+    """Reads a process's part of a global snapshot."""
+    with open(snapshot_path(log_file, snapshot_id), "r") as f:
+        return json.load(f)
+
+class LocalSnapshot:
+    """One process's part of a Chandy-Lamport global snapshot.
+
+    Holds the recorded local state and, for every incoming channel, the messages that
+    arrived after the state was recorded but before that channel's marker.
+    """
+
+    def __init__(self, snapshot_id, peers, state):
+        self.snapshot_id = snapshot_id
+        self.state = state
+        self.channels = {peer: [] for peer in peers}
+        self.open_channels = set(peers)
+        self.recorded_at = time.time()
+        self.pause_time = 0.0  # Seconds the tick loop was held while recording and sending markers
+        self.markers_sent = False
+
+    def record_message(self, sender_id, received_clock, system_time):
+        """Records an in-flight message if its channel is still being recorded."""
+        if sender_id in self.open_channels:
+            self.channels[sender_id].append((received_clock, system_time))
+
+    def close_channel(self, sender_id):
+        """Stops recording a channel once its marker arrives."""
+        self.open_channels.discard(sender_id)
+
+    def write(self, path):
+        """Writes the completed snapshot and returns the number of bytes written."""
+        record = {
+            **self.state,
+            "snapshot_id": self.snapshot_id,
+            "channels": self.channels,
+            "pause_ms": self.pause_time * 1000,
+            "completion_ms": (time.time() - self.recorded_at) * 1000,
+        }
+        data = json.dumps(record, indent=2)
+        with open(path, "w") as f:
+            f.write(data)
+        return len(data)
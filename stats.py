@@ -0,0 +1,115 @@
+import json
+import math
+import threading
+
+
+class RunningMoments:
+    """Tracks count, mean, and variance of a stream using Welford's algorithm."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+
+    @property
+    def variance(self):
+        """Population variance, matching np.var on the same values."""
+        return self._m2 / self.count if self.count else 0.0
+
+
+class CountHistogram:
+    """Exact quantiles of a stream of small non-negative integers, such as queue lengths.
+
+    Keeps one count per distinct value, so memory grows with the largest value seen
+    rather than with the number of values.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+
+    def add(self, x):
+        self.counts[x] = self.counts.get(x, 0) + 1
+        self.total += 1
+
+    def quantile(self, p):
+        """Returns the value at rank round(p * (n - 1)) of the sorted stream (0 if empty)."""
+        if not self.total:
+            return 0
+        rank = round(p * (self.total - 1))
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen > rank:
+                return value
+
+
+class EventStats:
+    """Running statistics over the events a VirtualMachine logs.
+
+    Mirrors what table.py derives from a finished log (clock jumps between consecutive
+    log lines, queue length at each event) without keeping the events in memory.
+    """
+
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.jumps = RunningMoments()
+        self.queue = RunningMoments()
+        self.queue_max = 0
+        self.queue_histogram = CountHistogram()
+        self.counts = {"SEND": 0, "RECEIVE": 0, "INTERNAL": 0}
+        self.drift = RunningMoments()  # Only fed in hlc clock mode
+        self.drift_max = 0
+        self.last_clock = None
+
+    def update(self, event_type, queue_length, logical_clock, drift=None):
+        """Folds one logged event (and its HLC drift from wall time, if any) into the running statistics."""
+        with self._lock:
+            kind = event_type.split(" ", 1)[0]
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+
+            if self.last_clock is not None:
+                self.jumps.add(abs(logical_clock - self.last_clock))
+            self.last_clock = logical_clock
+
+            self.queue.add(queue_length)
+            self.queue_max = max(self.queue_max, queue_length)
+            self.queue_histogram.add(queue_length)
+
+            if drift is not None:
+                self.drift.add(drift)
+                self.drift_max = drift if self.drift.count == 1 else max(self.drift_max, drift)
+
+    def summary(self):
+        """Returns a JSON-serializable snapshot of the current statistics."""
+        with self._lock:
+            return {
+                "events": self.queue.count,
+                "sends": self.counts["SEND"],
+                "receives": self.counts["RECEIVE"],
+                "internals": self.counts["INTERNAL"],
+                "jump_mean": self.jumps.mean,
+                "jump_variance": self.jumps.variance,
+                "jump_std": math.sqrt(self.jumps.variance),
+                "queue_mean": self.queue.mean,
+                "queue_max": self.queue_max,
+                **{f"queue_p{round(p * 100)}": self.queue_histogram.quantile(p) for p in self.QUANTILES},
+                "drift_mean": self.drift.mean,
+                "drift_max": self.drift_max,
+                "last_clock": self.last_clock,
+            }
+
+    def write_summary(self, path, **extra):
+        """Writes the summary (plus any extra fields, e.g. clock rate) to a JSON file."""
+        record = {**extra, **self.summary()}
+        with open(path, "w") as f:
+            json.dump(record, f, indent=2)
+        return record
@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 import os
 import re
+import json
+from hlc import to_ms
 
 # Define paths
 log_dir = "log/"
@@ -17,6 +19,7 @@ def read_log(file_path):
     logical_clock = []
     queue_length = []
     clock_rate = None
+    hlc_mode = False
 
     with open(file_path, "r") as file:
         for line in file:
@@ -24,19 +27,29 @@ def read_log(file_path):
                 match_clock = clock_rate_pattern.match(line.strip())
                 if match_clock:
                     clock_rate = int(match_clock.group(1))
+            if line.startswith("Clock Mode: hlc"):
+                hlc_mode = True  # Clock column holds packed HLC timestamps
 
             match = log_pattern.match(line.strip())
             if match:
                 event_type, sys_time, queue_len, log_clock = match.groups()
                 system_time.append(float(sys_time))
                 queue_length.append(int(queue_len))
-                logical_clock.append(int(log_clock))
+                logical_clock.append(to_ms(int(log_clock)) if hlc_mode else int(log_clock))
 
     return system_time, logical_clock, queue_length, clock_rate
 
 # Function to compute statistics from logs
 def compute_log_statistics(log_file):
     """Computes average jump size in logical clock and average queue length."""
+    # Prefer the summary the VM wrote at shutdown over re-reading the whole log, unless it
+    # predates the log (a rerun with the same id that crashed before writing its own)
+    summary_file = os.path.splitext(log_file)[0] + ".summary.json"
+    if os.path.exists(summary_file) and os.path.getmtime(summary_file) >= os.path.getmtime(log_file):
+        with open(summary_file, "r") as file:
+            summary = json.load(file)
+        return summary["clock_rate"], summary["jump_mean"], summary["queue_mean"]
+
     system_time, logical_clock, queue_length, clock_rate = read_log(log_file)
 
     avg_jump_size = np.mean(np.abs(np.diff(logical_clock))) if len(logical_clock) > 1 else 0
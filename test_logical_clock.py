@@ -1,10 +1,25 @@
 import pytest
 import time
 import queue
+import random
+import csv
+import os
+import json
+import threading
+import numpy as np
 from unittest.mock import MagicMock
 import logical_clock_pb2
 import logical_clock_pb2_grpc
 from run import ClockService, VirtualMachine
+from stats import EventStats
+from analyze import analyze
+from live import LogTail, record_drift
+from hlc import HybridLogicalClock, pack, unpack
+from snapshot import LocalSnapshot, snapshot_path, load_snapshot
+from netem import LinkEmulator
+from profiling import Profiler
+from message_queue import MessageQueue
+from cluster import Cluster, check_lamport_invariants, read_events
 import warnings
 
 import warnings
@@ -146,5 +161,407 @@ def test_message_queue(clock_service, mock_process):
 
     assert mock_process.event_queue.empty()  # Queue should be empty after processing
 
+# Test Running Statistics
+def test_event_stats_match_batch_statistics():
+    """Ensure the streaming statistics agree with what table.py computes from a full log."""
+    random.seed(0)
+    clocks = np.cumsum([random.randint(1, 5) for _ in range(1000)])
+    queue_lengths = [random.randint(0, 20) for _ in range(1000)]
+
+    stats = EventStats()
+    for clock, queue_length in zip(clocks, queue_lengths):
+        stats.update("INTERNAL", queue_length, int(clock))
+    summary = stats.summary()
+
+    assert summary["events"] == 1000
+    assert summary["internals"] == 1000
+    assert summary["jump_mean"] == pytest.approx(np.mean(np.abs(np.diff(clocks))))
+    assert summary["jump_variance"] == pytest.approx(np.var(np.abs(np.diff(clocks))))
+    assert summary["queue_mean"] == pytest.approx(np.mean(queue_lengths))
+    assert summary["queue_max"] == max(queue_lengths)
+    assert summary["queue_p50"] == np.percentile(queue_lengths, 50, method="nearest")
+    assert summary["queue_p90"] == np.percentile(queue_lengths, 90, method="nearest")
+    assert summary["queue_p99"] == np.percentile(queue_lengths, 99, method="nearest")
+
+    small = EventStats()  # Few distinct values, where a sketch would interpolate between them
+    for clock, queue_length in enumerate([0, 1, 1, 1, 2, 3, 0, 1, 3, 1]):
+        small.update("INTERNAL", queue_length, clock)
+    assert small.summary()["queue_p50"] == 1
+
+# Test GetStats RPC
+def test_get_stats(clock_service, mock_process):
+    """Ensure live statistics are served over RPC."""
+    mock_process.stats = EventStats()
+    mock_process.stats.update("SEND B", 0, 1)
+    mock_process.stats.update("RECEIVE C", 3, 5)
+
+    response = clock_service.GetStats(logical_clock_pb2.StatsRequest(), None)
+    assert response.process_id == "A"
+    assert response.events == 2
+    assert response.sends == 1
+    assert response.receives == 1
+    assert response.jump_mean == 4.0
+    assert response.queue_max == 3
+
+    mock_process.stats.update("INTERNAL", 0, 6, drift=-4)
+    mock_process.stats.update("INTERNAL", 0, 7, drift=-2)
+    response = clock_service.GetStats(logical_clock_pb2.StatsRequest(), None)
+    assert response.drift_mean == -3.0
+    assert response.drift_max == -2
+
+# Test Parallel Log Analysis
+def test_parallel_log_analysis(tmp_path):
+    """Ensure the pooled analysis streams one correct row per log file to CSV."""
+    for process, clocks in {"A": [1, 2, 5], "B": [1, 4, 6, 7]}.items():
+        with open(tmp_path / f"{process}1_custom.log", "w") as log:
+            log.write("Clock Rate: 3 ticks per second\n")
+            log.write(f"{'-' * 40}\n")
+            for i, clock in enumerate(clocks):
+                log.write(f"INTERNAL | {1000.0 + i} | {i} | {clock}\n")
+    (tmp_path / "notes.txt").write_text("not a log")
+    # Summary left by an earlier run with the same id must not shadow the newer log
+    stale_summary = tmp_path / "A1_custom.summary.json"
+    stale_summary.write_text(json.dumps({"clock_rate": 6, "events": 99}))
+    os.utime(stale_summary, (0, 0))
+
+    csv_path = tmp_path / "analysis.csv"
+    assert analyze(str(tmp_path), str(csv_path), workers=2, chunksize=1) == 2
+
+    with open(csv_path) as f:
+        rows = {row["Process"]: row for row in csv.DictReader(f)}
+    assert rows["A"]["Run"] == "Run 1_custom"
+    assert int(rows["A"]["Clock Speed"]) == 3
+    assert float(rows["A"]["Avg Jump"]) == pytest.approx(2.0)
+    assert float(rows["B"]["Avg Queue Len"]) == pytest.approx(1.5)
+    assert int(rows["B"]["Max Queue Len"]) == 3
+
+# Test Incremental Log Tailing
+def test_log_tail_reads_only_appended_lines(tmp_path):
+    """Ensure the live view parses new lines only, including ones written in pieces."""
+    log_path = tmp_path / "A1.log"
+    tail = LogTail(str(log_path), window=2)
+    assert tail.poll() == 0  # Log not created yet
+
+    with open(log_path, "w") as log:
+        log.write("Clock Rate: 2 ticks per second\n")
+        log.write(f"{'-' * 40}\n")
+        log.write("INTERNAL | 1000.0 | 0 | 1\n")
+        log.write("SEND B | 1000.5 | 0 | 2\n")
+        log.write("RECEIVE C | 1001.0 | 4 | ")  # Partially flushed line
+    assert tail.poll() == 2
+    assert tail.clock_rate == 2
+
+    with open(log_path, "a") as log:
+        log.write("9\n")
+    assert tail.poll() == 1
+    assert tail.events == 3
+    assert list(tail.logical_clock) == [2, 9]  # Window keeps only the last two samples
+    assert list(tail.queue_length) == [0, 4]
+    assert tail.offset == log_path.stat().st_size
+
+    # Summary from an earlier run with the same id does not end the tail
+    summary_path = tmp_path / "A1.summary.json"
+    summary_path.write_text("{}")
+    os.utime(log_path, (tail.started - 10, tail.started - 10))
+    os.utime(summary_path, (tail.started - 5, tail.started - 5))
+    assert not tail.finished
+    os.utime(summary_path, (tail.started + 1, tail.started + 1))
+    assert tail.finished
+
+# Test Live View Of HLC Logs
+def test_log_tail_reads_hlc_drift(tmp_path):
+    """Ensure an hlc tail shows the logical counter and the logged drift, not differences of packed timestamps."""
+    log_path = tmp_path / "A1_hlc.log"
+    with open(log_path, "w") as log:
+        log.write("Clock Rate: 2 ticks per second\nClock Mode: hlc\n")
+        log.write(f"INTERNAL | 1000.0 | 0 | {pack(1000000, 0)} | 0\n")
+        log.write(f"RECEIVE B | 1000.5 | 1 | {pack(1000600, 3)} | 100\n")
+    tail = LogTail(str(log_path), hlc=True)
+    assert tail.poll() == 2
+    assert list(tail.logical_clock) == [0, 3]
+    assert list(tail.drift) == [0, 100]
+
+    lamport = LogTail(str(tmp_path / "B1.log"))
+    lamport.logical_clock.append(5)
+    record_drift({"A": tail, "B": lamport}, 1001.0)
+    assert list(tail.drift) == [0, 100]  # Left untouched
+    assert list(lamport.drift) == [0]
+
+# Test Hybrid Logical Clock Update Rules
+def test_hybrid_logical_clock():
+    """Ensure HLC timestamps follow wall time and merge received timestamps correctly."""
+    now = [1000.0]
+    clock = HybridLogicalClock(now=lambda: now[0])
+
+    assert unpack(clock.tick()) == (1000000, 0)
+    assert unpack(clock.tick()) == (1000000, 1)  # Same millisecond, counter advances
+
+    # Receiving a timestamp from a node whose physical time is ahead
+    assert unpack(clock.receive(pack(1000005, 3))) == (1000005, 4)
+    # Equal physical parts: counter is one past the larger of the two
+    assert unpack(clock.receive(pack(1000005, 9))) == (1000005, 10)
+    # Stale timestamp: local physical part wins, counter advances
+    assert unpack(clock.receive(pack(999000, 50))) == (1000005, 11)
+
+    # Wall time overtakes the clock, so the counter resets
+    now[0] = 1001.0
+    assert unpack(clock.receive(pack(1000005, 0))) == (1001000, 0)
+    assert clock.drift_ms(1001.0) == 0
+
+# Test HLC Timestamps Are Queued In HLC Mode
+def test_send_message_uses_hlc_field(clock_service, mock_process):
+    """Ensure the packed HLC timestamp, not the float clock, is queued in hlc mode."""
+    mock_process.clock_mode = "hlc"
+    timestamp = pack(1741132054597, 2)
+    request = logical_clock_pb2.ClockMessage(sender_id="B", logical_clock=0, system_time=time.time(), hlc=timestamp)
+
+    clock_service.SendMessage(request, None)
+    sender_id, received_clock, system_time = mock_process.event_queue.get()
+    assert sender_id == "B"
+    assert received_clock == timestamp
+
+# Test Snapshot Channel Recording
+def test_local_snapshot_records_in_flight_messages(tmp_path):
+    """Ensure only messages arriving before a channel's marker are kept as channel state."""
+    state = {"process_id": "A", "logical_clock": 7, "event_queue": [("B", 5.0, 1000.0)], "log_offset": 120, "elapsed": 3.0}
+    snapshot = LocalSnapshot(1, ["B", "C"], state)
+
+    snapshot.record_message("B", 6.0, 1000.1)
+    snapshot.close_channel("B")
+    snapshot.record_message("B", 8.0, 1000.2)  # After B's marker: not in flight
+    snapshot.record_message("C", 9.0, 1000.3)
+    snapshot.close_channel("C")
+    assert not snapshot.open_channels
+
+    log_file = str(tmp_path / "A1.log")
+    bytes_written = snapshot.write(snapshot_path(log_file, 1))
+    assert bytes_written == os.path.getsize(tmp_path / "A1.snapshot-1.json")
+
+    restored = load_snapshot(log_file, 1)
+    assert restored["logical_clock"] == 7
+    assert restored["log_offset"] == 120
+    assert restored["event_queue"] == [["B", 5.0, 1000.0]]
+    assert restored["channels"] == {"B": [[6.0, 1000.1]], "C": [[9.0, 1000.3]]}
+
+# Test Restore Keeps The Snapshotted Clock Rate
+def test_restore_keeps_snapshot_clock_rate(tmp_path):
+    """Ensure a restarted "default" run continues at the rate it was snapshotted at, not a new random one."""
+    log_file = tmp_path / "A1.log"
+    log_file.write_text("Clock Rate: 4 ticks per second\n" + "-" * 40 + "\nINTERNAL | 1000.0 | 0 | 1\n")
+    state = {"process_id": "A", "logical_clock": 1, "clock_rate": 4, "max_action": 7, "event_queue": [],
+             "log_offset": log_file.stat().st_size, "elapsed": 1.0}
+    LocalSnapshot(1, [], state).write(snapshot_path(str(log_file), 1))
+
+    vm = VirtualMachine("A", "0", None, 1, None, "default", restore_snapshot=1, log_dir=str(tmp_path), clock_rate=6, connect=False)
+    try:
+        assert vm.clock_rate == 4
+        assert vm.max_action == 7
+        assert vm.logical_clock == 1
+        assert vm.stats.summary()["events"] == 1
+    finally:
+        vm.stop()
+
+# Test Snapshot Taken Before The Run Starts
+def test_snapshot_before_run_records_this_runs_log(tmp_path):
+    """Ensure a marker that arrives before run() records an offset into the new log, so a restore keeps its header."""
+    log_file = tmp_path / "A1.log"
+    log_file.write_text("Clock Rate: 9 ticks per second\n" + "INTERNAL | 1000.0 | 0 | 1\n" * 50)  # Old run, same id
+
+    vm = VirtualMachine("A", "0", None, 1, None, "default", log_dir=str(tmp_path), clock_rate=4, connect=False)
+    try:
+        vm.set_peers({}, {"A": vm.port})
+        vm.record_and_send_markers(1)
+        snapshot = load_snapshot(str(log_file), 1)
+        assert snapshot["log_offset"] == log_file.stat().st_size
+        assert log_file.read_text().startswith("Clock Rate: 4 ticks per second")
+    finally:
+        vm.stop()
+
+    restored = VirtualMachine("A", "0", None, 1, None, "default", restore_snapshot=1, log_dir=str(tmp_path), connect=False)
+    try:
+        assert log_file.read_text().startswith("Clock Rate: 4 ticks per second")
+        assert restored.clock_rate == 4
+    finally:
+        restored.stop()
+
+# Test Emulated Link Delay and Ordering
+def test_link_emulator_delays_and_keeps_fifo(tmp_path):
+    """Ensure emulated links inject the configured delay, keep FIFO order, and log each message."""
+    log_file = tmp_path / "A1.netem.txt"
+    link = LinkEmulator("A->B", latency_ms=30, jitter_ms=10, distribution="uniform", seed=1, log_file=str(log_file))
+    delivered = []
+
+    start = time.time()
+    for i in range(10):
+        assert link.submit(16, lambda i=i: delivered.append((i, time.time())))
+    link.close(timeout=5)
+
+    assert [i for i, _ in delivered] == list(range(10))  # Jitter alone never reorders
+    assert all(t - start >= 0.019 for _, t in delivered)
+    lines = log_file.read_text().splitlines()
+    assert len(lines) == 10
+    link_name, _, size, scheduled_ms, actual_ms, status = lines[0].split(" | ")
+    assert (link_name, size, status) == ("A->B", "16", "DELIVERED")
+    assert float(actual_ms) >= float(scheduled_ms) >= 20
+
+# Test Emulated Link Loss and Bandwidth
+def test_link_emulator_loss_and_bandwidth():
+    """Ensure dropped messages are never delivered and a bandwidth cap queues messages."""
+    lossy = LinkEmulator("A->B", loss=1.0, seed=1)
+    delivered = []
+    assert not lossy.submit(16, lambda: delivered.append(1))
+    lossy.close(timeout=1)
+    assert delivered == []
+
+    capped = LinkEmulator("A->C", bandwidth_kbps=8)  # 1000 bytes per second
+    start = time.time()
+    for _ in range(3):
+        capped.submit(50, lambda: delivered.append(time.time()))
+    capped.close(timeout=5)
+    assert delivered[-1] - start >= 0.14  # 150 bytes take 150 ms on the capped link
+
+# Test Reliable Control Traffic On Emulated Links
+def test_link_emulator_reliable_messages_are_not_lost_or_reordered():
+    """Ensure reliable messages skip loss and arrive after every message submitted before them."""
+    link = LinkEmulator("A->B", latency_ms=5, loss=0.5, reorder=1.0, reorder_delay_ms=100, seed=1)
+    delivered = []
+    sent = [i for i in range(10) if link.submit(16, lambda i=i: delivered.append(i))]
+    assert link.submit(16, lambda: delivered.append("marker"), reliable=True)
+    link.close(timeout=5)
+
+    assert sorted(delivered[:-1]) == sent  # Every message that was not dropped is delivered first
+    assert delivered[-1] == "marker"
+
+# Test Profiling Artifacts
+def test_profiler_writes_artifacts(tmp_path):
+    """Ensure each profiling mode writes its artifact and phase timers count budget misses."""
+    profiler = Profiler(["phases", "sample", "tracemalloc", "cprofile"], str(tmp_path / "A1"))
+    profiler.start()
+    with profiler.phase("log"):
+        time.sleep(0.02)
+    profiler.record("tick", 0.5, budget=1 / 6)
+    profiler.record("tick", 0.1, budget=1 / 6)
+    written = profiler.stop()
+
+    assert {os.path.basename(path) for path in written} == {
+        "A1.cprofile.pstats", "A1.samples.folded", "A1.tracemalloc", "A1.tracemalloc.txt", "A1.phases.json"
+    }
+    with open(tmp_path / "A1.phases.json") as f:
+        phases = json.load(f)
+    assert phases["log"]["count"] == 1
+    assert phases["log"]["total_ms"] >= 15
+    assert phases["tick"]["count"] == 2
+    assert phases["tick"]["over_budget"] == 1
+    assert "test_profiler_writes_artifacts" in (tmp_path / "A1.samples.folded").read_text()
+
+# Test Profiling Is Off By Default
+def test_profiler_disabled_is_noop(tmp_path):
+    """Ensure a profiler without modes records nothing and writes no files."""
+    profiler = Profiler(None, str(tmp_path / "A1"))
+    profiler.start()
+    with profiler.phase("log"):
+        pass
+    profiler.record("tick", 1.0)
+    assert profiler.stop() == []
+    assert list(tmp_path.iterdir()) == []
+
+# Test Array-Backed Message Queue
+def test_message_queue_fifo_growth_and_batches():
+    """Ensure the ring keeps FIFO order across wraparound and growth, and drains in batches."""
+    q = MessageQueue(capacity=4)
+    q.put(("A", 1.0, 1000.0))
+    q.put(("B", 2.0, 1000.1))
+    assert q.get() == ("A", 1.0, 1000.0)  # Head moves, so later puts wrap around
+
+    for i in range(3, 12):
+        q.put(("C" if i % 2 else "B", float(i), 1000.0 + i))
+    assert q.qsize() == 10
+    assert q.snapshot()[0] == ("B", 2.0, 1000.1)
+    assert q.qsize() == 10  # Snapshot does not consume
+
+    batch = q.get_batch(4)
+    assert [clock for _, clock, _ in batch] == [2.0, 3.0, 4.0, 5.0]
+    assert [clock for _, clock, _ in q.get_batch()] == [6.0, 7.0, 8.0, 9.0, 10.0, 11.0]
+    assert q.empty()
+    with pytest.raises(queue.Empty):
+        q.get_nowait()
+    with pytest.raises(queue.Empty):
+        q.get(timeout=0.01)
+
+# Test Message Queue Keeps HLC Timestamps Exact
+def test_message_queue_hlc_precision_and_blocking_get(clock_service, mock_process):
+    """Ensure packed HLC timestamps survive the queue and a blocked consumer wakes up."""
+    mock_process.event_queue = MessageQueue("Q")
+    mock_process.clock_mode = "hlc"
+    timestamp = pack(1741132054597, 3)  # Too large to be exact as a double
+
+    consumer_result = []
+    consumer = threading.Thread(target=lambda: consumer_result.append(mock_process.event_queue.get(timeout=2)))
+    consumer.start()
+    request = logical_clock_pb2.ClockMessage(sender_id="C", system_time=time.time(), hlc=timestamp)
+    clock_service.SendMessage(request, None)
+    consumer.join()
+
+    sender_id, received_clock, _ = consumer_result[0]
+    assert sender_id == "C"
+    assert received_clock == timestamp
+
+# Test Lamport Invariant Checker
+def test_lamport_invariant_checker_flags_violations(tmp_path):
+    """Ensure the checker reports non-increasing clocks and receives that do not follow their send."""
+    logs = {
+        "A": ["SEND B | 1000.0 | 0 | 1", "INTERNAL | 1000.1 | 0 | 1"],
+        "B": ["RECEIVE A | 1000.2 | 0 | 1"],
+    }
+    log_files = {}
+    for process, lines in logs.items():
+        log_files[process] = tmp_path / f"{process}1.log"
+        log_files[process].write_text("Clock Rate: 1 ticks per second\n" + "\n".join(lines) + "\n")
+
+    violations = check_lamport_invariants(log_files)
+    assert "A: clock went from 1 to 1 at INTERNAL" in violations
+    assert "A->B: sent at 1, received at 1" in violations
+
+# Test Full Cluster On Ephemeral Ports
+def test_cluster_run_satisfies_lamport_invariants(tmp_path):
+    """Run a real three-process cluster with one slow process and check its logs."""
+    log_files = Cluster(n=3, log_dir=str(tmp_path), duration=2, clock_rates={"A": 5, "B": 30, "C": 30}).run()
+
+    assert set(log_files) == {"A", "B", "C"}
+    events = {process: read_events(log_file) for process, log_file in log_files.items()}
+    assert all(len(process_events) > 5 for process_events in events.values())
+    assert any(event_type.startswith("RECEIVE") for event_type, _ in events["A"])
+    assert check_lamport_invariants(log_files) == []
+    assert os.path.exists(tmp_path / "A1.summary.json")
+
+# Test Full Cluster With Snapshots
+def test_cluster_snapshots_are_written(tmp_path):
+    """Run a four-process cluster where A initiates snapshots and check every process took part."""
+    log_files = Cluster(n=4, log_dir=str(tmp_path), duration=2, node_options={"A": {"snapshot_interval": 0.5}}).run()
+
+    assert check_lamport_invariants(log_files) == []
+    for process, log_file in log_files.items():
+        snapshot = load_snapshot(log_file, 1)
+        assert snapshot["process_id"] == process
+        assert snapshot["clock_rate"] == 10
+        assert snapshot["log_offset"] <= os.path.getsize(log_file)
+
+# Test Snapshots Over A Lossy Network
+def test_cluster_snapshots_complete_on_lossy_links(tmp_path):
+    """Ensure delayed, dropped, and reordered messages do not leave a snapshot open and block later ones."""
+    log_files = Cluster(n=3, log_dir=str(tmp_path), duration=2, netem="lossy", netem_seed=1,
+                        node_options={"A": {"snapshot_interval": 0.1}}).run()
+
+    assert check_lamport_invariants(log_files) == []
+    snapshot_ids = {
+        process: sorted(int(name.rsplit("-", 1)[1].split(".")[0]) for name in os.listdir(tmp_path)
+                        if name.startswith(f"{process}1.snapshot-"))
+        for process in log_files
+    }
+    # Numbered 1..k without gaps: no snapshot was left open, blocking the ones after it
+    assert len(snapshot_ids["A"]) >= 2
+    assert snapshot_ids["A"] == list(range(1, len(snapshot_ids["A"]) + 1))
+    assert snapshot_ids["B"] == snapshot_ids["C"] == snapshot_ids["A"]
+
 if __name__ == "__main__":
     pytest.main()